@@ -3,23 +3,271 @@
 
 import asyncio
 import aiohttp
+import fcntl
 import json
+import operator
+import os
 import pandas as pd
 import numpy as np
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass
+from functools import lru_cache
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict
 import uvicorn
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
-import pickle
+import joblib
+from joblib import parallel_backend
+from cachetools import TTLCache
+from aiolimiter import AsyncLimiter
 import logging
 
+try:
+    import lightgbm as lgb
+except ImportError:  # LightGBM backend is optional
+    lgb = None
+
+try:
+    import cudf
+    from cuml.ensemble import IsolationForest as CumlIsolationForest
+    GPU_AVAILABLE = True
+except ImportError:  # GPU retraining needs RAPIDS cuML
+    GPU_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # Without numba the kernels run as plain Python
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Wallet data is served from mock JSON-RPC responses (see _send_batch)
+RPC_BATCH_LIMIT = 1000  # Max calls per batched HTTP request
+RPC_MAX_CONCURRENCY = 20  # Max in-flight RPC requests per collector
+RPC_RATE_LIMIT = 50  # Max RPC requests per second per collector
+TOKEN_PROGRAM_ID = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+
+# Scoring backend: "isolation_forest" (default) or "lightgbm"
+MODEL_BACKEND = os.environ.get("FRAUD_MODEL_BACKEND", "isolation_forest")
+
+# Training labels for the LightGBM backend; unlabeled rows are left out
+LABEL_RUGPULL, LABEL_LEGITIMATE, LABEL_UNKNOWN = 1, 0, -1
+
+# Features withheld from the booster: rugpull_history is the label itself
+BOOSTER_EXCLUDED_FEATURES = ('rugpull_history',)
+
+# Fewer labeled wallets than this train the IsolationForest instead of a booster
+BOOSTER_MIN_TRAINING_ROWS = 200
+
+# Launch parameter thresholds
+SECONDS_PER_DAY = 86400
+MIN_TIMELOCK_SECONDS = 100 * SECONDS_PER_DAY
+SAFE_TIMELOCK_SECONDS = 200 * SECONDS_PER_DAY
+
+# Version of the feature definitions in WalletPatternBatch.to_feature_matrix;
+# bump it when they change so older model files are retrained
+FEATURE_VERSION = 2
+
+# Persisted models: the sklearn/LightGBM inference model and the optional
+# cuML forest from GPU retraining, kept apart so CPU-only hosts can still boot
+MODEL_PATH = "fraud_model.pkl"
+GPU_MODEL_PATH = "fraud_model_gpu.pkl"
+
+# Seconds between checks for model files retrained by another worker
+MODEL_RELOAD_INTERVAL_SECONDS = 5
+
+# Score IsolationForest with the packed-tree kernel instead of sklearn
+# (on by default only when numba can compile it; interpreted it is slower)
+USE_FLAT = os.environ.get("USE_FLAT", "1" if NUMBA_AVAILABLE else "0") != "0"
+
+# Score with a forest compiled to Python source at fit time (takes precedence)
+USE_CODEGEN = os.environ.get("USE_CODEGEN", "0") == "1"
+
+# Probe rows and tolerance for checking packed-tree scores against sklearn
+FLAT_PARITY_ROWS = 256
+FLAT_PARITY_TOLERANCE = 1e-9
+
+@njit(cache=True)
+def _rule_kernel(rugpull_history, quick_sells, token_launches, social_signals,
+                 timelock_violations, age_days, tx_count):
+    """Compiled rule-based fraud score over scalar wallet indicators"""
+    score = 0.0
+    
+    # Known rugpull history
+    if rugpull_history > 0:
+        score += 0.8
+    
+    # Quick sell behavior
+    if quick_sells > token_launches * 0.5:
+        score += 0.3
+    
+    # Low social signals
+    if social_signals == 0:
+        score += 0.2
+    
+    # High timelock violations
+    if timelock_violations > 0:
+        score += 0.4
+    
+    # New account with high activity
+    if age_days < 30 and tx_count > 100:
+        score += 0.3
+    
+    return min(1.0, score)
+
+def _average_path_length(n_samples: np.ndarray) -> np.ndarray:
+    """Average path length of an unsuccessful BST search over n samples"""
+    n = np.asarray(n_samples, dtype=np.float64)
+    result = np.zeros_like(n)
+    result[n == 2] = 1.0
+    big = n > 2
+    result[big] = 2.0 * (np.log(n[big] - 1.0) + np.euler_gamma) - 2.0 * (n[big] - 1.0) / n[big]
+    return result
+
+def pack_trees_wdfs(model: IsolationForest) -> Tuple[np.ndarray, ...]:
+    """Flatten a fitted forest into contiguous arrays in weighted-DFS order
+    
+    Nodes of every tree are concatenated so that the heavier child (more
+    training samples) directly follows its parent, keeping the most common
+    descent paths in adjacent memory. Leaves store their full path-length
+    contribution, so scoring is a pure descent plus one add per tree.
+    """
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    
+    for estimator, estimator_features in zip(model.estimators_, model.estimators_features_):
+        tree = estimator.tree_
+        children_left = tree.children_left
+        children_right = tree.children_right
+        n_node_samples = tree.n_node_samples
+        
+        # Weighted DFS: pop the heavier child immediately after its parent
+        order, depths = [], []
+        stack = [(0, 0)]
+        while stack:
+            node, depth = stack.pop()
+            order.append(node)
+            depths.append(depth)
+            left, right = children_left[node], children_right[node]
+            if left != -1:
+                if n_node_samples[left] >= n_node_samples[right]:
+                    stack.append((right, depth + 1))
+                    stack.append((left, depth + 1))
+                else:
+                    stack.append((left, depth + 1))
+                    stack.append((right, depth + 1))
+        
+        order = np.asarray(order, dtype=np.int64)
+        new_index = np.empty(len(order), dtype=np.int64)
+        new_index[order] = np.arange(len(order)) + offset
+        
+        is_leaf = children_left[order] == -1
+        feature = np.where(
+            is_leaf, -1, np.asarray(estimator_features)[np.maximum(tree.feature[order], 0)]
+        )
+        left = np.where(is_leaf, -1, new_index[np.maximum(children_left[order], 0)])
+        right = np.where(is_leaf, -1, new_index[np.maximum(children_right[order], 0)])
+        value = np.where(
+            is_leaf, np.asarray(depths, dtype=np.float64) + _average_path_length(n_node_samples[order]), 0.0
+        )
+        
+        features.append(feature)
+        thresholds.append(tree.threshold[order])
+        lefts.append(left)
+        rights.append(right)
+        values.append(value)
+        roots.append(offset)
+        offset += len(order)
+    
+    denominator = len(model.estimators_) * _average_path_length([model.max_samples_])[0]
+    return (
+        np.ascontiguousarray(np.concatenate(features), dtype=np.int32),
+        np.ascontiguousarray(np.concatenate(thresholds), dtype=np.float64),
+        np.ascontiguousarray(np.concatenate(lefts), dtype=np.int32),
+        np.ascontiguousarray(np.concatenate(rights), dtype=np.int32),
+        np.ascontiguousarray(np.concatenate(values), dtype=np.float64),
+        np.asarray(roots, dtype=np.int64),
+        float(denominator)
+    )
+
+@njit(cache=True)
+def score_samples_flat(X, feature, threshold, left, right, value, roots, denominator):
+    """IsolationForest.score_samples over trees packed by pack_trees_wdfs"""
+    n_samples = X.shape[0]
+    scores = np.empty(n_samples)
+    for i in range(n_samples):
+        total = 0.0
+        for t in range(roots.shape[0]):
+            node = roots[t]
+            while feature[node] >= 0:
+                if X[i, feature[node]] <= threshold[node]:
+                    node = left[node]
+                else:
+                    node = right[node]
+            total += value[node]
+        scores[i] = -(2.0 ** (-total / denominator))
+    return scores
+
+def flat_scores_match_sklearn(model: IsolationForest, flat_trees: Tuple[np.ndarray, ...]) -> bool:
+    """Check score_samples_flat against IsolationForest.score_samples
+    
+    pack_trees_wdfs relies on sklearn internals (estimators_features_,
+    max_samples_, the leaf path-length formula), so a scikit-learn release
+    that changes them is caught here instead of silently skewing scores.
+    """
+    rng = np.random.default_rng(0)
+    X = (2.0 * rng.standard_normal((FLAT_PARITY_ROWS, model.n_features_in_))).astype(np.float32)
+    expected = model.score_samples(X)
+    actual = score_samples_flat(X, *flat_trees)
+    return bool(np.allclose(actual, expected, rtol=0.0, atol=FLAT_PARITY_TOLERANCE))
+
+def generate_forest_scorer(flat_trees: Tuple[np.ndarray, ...]):
+    """Compile packed trees into straight-line Python for the fixed feature schema
+    
+    Every tree becomes nested if/else on constant feature indices and
+    thresholds. The source is compiled in memory; the caller keeps the
+    returned scorer only as long as it keeps the forest.
+    """
+    feature, threshold, left, right, value, roots, denominator = flat_trees
+    
+    lines = ["def _score_row(x):", "    total = 0.0"]
+    for root in roots:
+        stack = [(int(root), 1)]
+        while stack:
+            node, depth = stack.pop()
+            indent = "    " * depth
+            if node < 0:
+                # Marker for the else branch of the parent split
+                lines.append(f"{indent[4:]}else:")
+                continue
+            if feature[node] < 0:
+                lines.append(f"{indent}total += {float(value[node])!r}")
+                continue
+            lines.append(f"{indent}if x[{int(feature[node])}] <= {float(threshold[node])!r}:")
+            stack.append((int(right[node]), depth + 1))
+            stack.append((-1, depth + 1))
+            stack.append((int(left[node]), depth + 1))
+    lines.append(f"    return -(2.0 ** (-total / {float(denominator)!r}))")
+    lines.append("")
+    lines.append("def score_samples(X):")
+    lines.append("    return [_score_row(row) for row in X.tolist()]")
+    source = "\n".join(lines) + "\n"
+    
+    namespace: Dict[str, object] = {}
+    exec(compile(source, "<fraud_scorer>", "exec"), namespace)
+    return namespace["score_samples"]
+
 @dataclass
 class WalletPattern:
     """Wallet behavior pattern for fraud detection"""
@@ -33,6 +281,66 @@ class WalletPattern:
     rugpull_history: int  # Number of confirmed rugpulls
     timelock_violations: int
     social_signals: int  # GitHub, Twitter, Discord activity
+    is_fallback: bool = False  # Placeholder after failed data collection
+
+@dataclass
+class WalletPatternBatch:
+    """Struct-of-arrays view over many wallet patterns"""
+    address: np.ndarray  # object
+    creation_time_epoch: np.ndarray  # int64, seconds
+    transaction_count: np.ndarray  # int64
+    total_volume: np.ndarray  # float64
+    unique_interactions: np.ndarray  # int64
+    token_launches: np.ndarray  # int64
+    quick_sells: np.ndarray  # int64
+    rugpull_history: np.ndarray  # int64
+    timelock_violations: np.ndarray  # int64
+    social_signals: np.ndarray  # int64
+    
+    @classmethod
+    def from_patterns(cls, patterns: List[WalletPattern]) -> 'WalletPatternBatch':
+        """Build column arrays from a list of wallet patterns"""
+        n = len(patterns)
+        
+        def column(attr: str, dtype) -> np.ndarray:
+            return np.fromiter((getattr(p, attr) for p in patterns), dtype=dtype, count=n)
+        
+        return cls(
+            address=np.array([p.address for p in patterns], dtype=object),
+            creation_time_epoch=np.fromiter(
+                (int(p.creation_time.timestamp()) for p in patterns), dtype=np.int64, count=n
+            ),
+            transaction_count=column('transaction_count', np.int64),
+            total_volume=column('total_volume', np.float64),
+            unique_interactions=column('unique_interactions', np.int64),
+            token_launches=column('token_launches', np.int64),
+            quick_sells=column('quick_sells', np.int64),
+            rugpull_history=column('rugpull_history', np.int64),
+            timelock_violations=column('timelock_violations', np.int64),
+            social_signals=column('social_signals', np.int64)
+        )
+    
+    def __len__(self) -> int:
+        return len(self.address)
+    
+    def to_feature_matrix(self, now: Optional[datetime] = None) -> np.ndarray:
+        """Compute the (N, 11) feature matrix with column-wise numpy arithmetic"""
+        now_epoch = int((now or datetime.now()).timestamp())
+        tx_count = np.maximum(self.transaction_count, 1)
+        
+        X = np.empty((len(self), 11), dtype=np.float64)
+        X[:, 0] = self.transaction_count
+        X[:, 1] = np.log1p(self.total_volume)  # lamports, up to ~1e18
+        X[:, 2] = self.unique_interactions
+        X[:, 3] = self.token_launches
+        X[:, 4] = self.quick_sells
+        X[:, 5] = self.rugpull_history
+        X[:, 6] = self.timelock_violations
+        X[:, 7] = self.social_signals
+        X[:, 8] = (now_epoch - self.creation_time_epoch) // SECONDS_PER_DAY
+        X[:, 9] = np.log1p(self.total_volume / tx_count)
+        X[:, 10] = self.unique_interactions / tx_count
+        return X
 
 @dataclass
 class LaunchPattern:
@@ -46,25 +354,50 @@ class LaunchPattern:
     initial_liquidity: float
     team_allocation: float
 
+# Known rugpull addresses from public databases
+DEFAULT_KNOWN_RUGPULLS = frozenset({
+    "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM",  # Squid Game Token
+    "Bx7k2J8vQp3R5nM1Ks6Hf9Ld4Cv8Bn2Xr7Yq1Zw89Qm",  # SafeMoon Clone
+    "FvshM7f3mUo5oErznADVxMEqC58PdK6aYVD9kSz2cHg7",  # Titan Finance
+})
+
+DEFAULT_LEGITIMATE_PROJECTS = frozenset({
+    "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
+    "So11111111111111111111111111111111111111112",   # Wrapped SOL
+    "mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So",   # Marinade SOL
+})
+
+@lru_cache(maxsize=None)
+def _load_address_set(filepath: Optional[str], default: frozenset) -> frozenset:
+    """Load one address per line ('#' starts a comment), falling back to default"""
+    if not filepath:
+        return default
+    try:
+        with open(filepath) as f:
+            addresses = (line.split('#', 1)[0].strip() for line in f)
+            return frozenset(address for address in addresses if address)
+    except FileNotFoundError:
+        logger.warning(f"Address list {filepath} not found, using built-in list")
+        return default
+
 class FraudDataCollector:
     """Collects historical fraud data for model training"""
     
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
-        self.known_rugpulls = [
-            # Known rugpull addresses from public databases
-            "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM",  # Squid Game Token
-            "Bx7k2J8vQp3R5nM1Ks6Hf9Ld4Cv8Bn2Xr7Yq1Zw89Qm",  # SafeMoon Clone
-            "FvshM7f3mUo5oErznADVxMEqC58PdK6aYVD9kSz2cHg7",  # Titan Finance
-        ]
-        self.legitimate_projects = [
-            "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",  # USDC
-            "So11111111111111111111111111111111111111112",   # Wrapped SOL
-            "mSoLzYCxHdYgdzU16g5QSh3i5K3z3KZK7ytfqcJm7So",   # Marinade SOL
-        ]
+        # Bound fan-out and request rate toward the RPC provider
+        self._sem = asyncio.Semaphore(RPC_MAX_CONCURRENCY)
+        self._bucket = AsyncLimiter(RPC_RATE_LIMIT, 1.0)
+        self.known_rugpulls: frozenset = _load_address_set(
+            os.environ.get("KNOWN_RUGPULLS_FILE"), DEFAULT_KNOWN_RUGPULLS
+        )
+        self.legitimate_projects: frozenset = _load_address_set(
+            os.environ.get("LEGITIMATE_PROJECTS_FILE"), DEFAULT_LEGITIMATE_PROJECTS
+        )
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        connector = aiohttp.TCPConnector(limit=100, keepalive_timeout=60)
+        self.session = aiohttp.ClientSession(connector=connector)
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
@@ -73,11 +406,47 @@ class FraudDataCollector:
     
     async def collect_wallet_data(self, address: str) -> WalletPattern:
         """Collect comprehensive wallet behavior data"""
+        return (await self.collect_wallets_data([address]))[0]
+    
+    async def collect_wallets_data(self, addresses: List[str]) -> List[WalletPattern]:
+        """Collect wallet behavior data for many wallets in one RPC batch"""
+        calls = []
+        for address in addresses:
+            calls.extend(self._wallet_calls(address))
+        
+        try:
+            responses = await self._batch_fetch(calls)
+        except Exception as e:
+            logger.error(f"Batch RPC request failed: {e}")
+            return [self._default_pattern(address) for address in addresses]
+        
+        patterns = []
+        per_wallet = len(calls) // max(len(addresses), 1)
+        for i, address in enumerate(addresses):
+            wallet_responses = responses[i * per_wallet:(i + 1) * per_wallet]
+            patterns.append(await self._build_pattern(address, wallet_responses))
+        return patterns
+    
+    def _wallet_calls(self, address: str) -> List[dict]:
+        """JSON-RPC calls needed to profile one wallet"""
+        return [
+            {"method": "getAccountInfo", "params": [address, {"encoding": "jsonParsed"}]},
+            {"method": "getSignaturesForAddress", "params": [address, {"limit": 1000}]},
+            {"method": "getTokenAccountsByOwner", "params": [
+                address, {"programId": TOKEN_PROGRAM_ID}, {"encoding": "jsonParsed"}
+            ]},
+        ]
+    
+    async def _build_pattern(self, address: str, responses: List[dict]) -> WalletPattern:
+        """Turn one wallet's RPC responses into a WalletPattern"""
         try:
-            # Solscan API calls (simplified)
-            account_info = await self._fetch_account_info(address)
-            transactions = await self._fetch_transactions(address)
-            token_accounts = await self._fetch_token_accounts(address)
+            for response in responses:
+                if 'error' in response:
+                    raise RuntimeError(response['error'])
+            
+            account_info = (responses[0].get('result') or {}).get('value') or {}
+            transactions = responses[1].get('result') or []
+            token_accounts = (responses[2].get('result') or {}).get('value') or []
             
             # Calculate fraud indicators
             pattern = WalletPattern(
@@ -99,37 +468,77 @@ class FraudDataCollector:
             logger.error(f"Error collecting data for {address}: {e}")
             return self._default_pattern(address)
     
-    async def _fetch_account_info(self, address: str) -> dict:
-        """Fetch basic account information"""
-        # Mock API call - replace with actual Solscan/Helius API
-        await asyncio.sleep(0.1)  # Rate limiting
+    async def _batch_fetch(self, calls: List[dict]) -> List[dict]:
+        """Send JSON-RPC calls as batched HTTP requests, responses in call order"""
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": call["method"], "params": call.get("params", [])}
+            for i, call in enumerate(calls)
+        ]
+        
+        responses = []
+        for start in range(0, len(payload), RPC_BATCH_LIMIT):
+            chunk = payload[start:start + RPC_BATCH_LIMIT]
+            async with self._sem, self._bucket:
+                body = await self._send_batch(chunk)
+            if not isinstance(body, list):
+                # e.g. a single error object rejecting the whole batch
+                raise RuntimeError(f"JSON-RPC batch rejected: {body!r}")
+            responses.extend(body)
+        
+        # Servers may answer a batch out of order, so match on id
+        by_id = {response.get('id'): response for response in responses}
+        return [by_id.get(request['id'], {'error': 'missing response'}) for request in payload]
+    
+    async def _send_batch(self, chunk: List[dict]):
+        """Send one JSON-RPC batch and return the decoded response body
+        
+        Mock-only for now: real getSignaturesForAddress results carry no
+        amount, counterpart or type, so a live endpoint needs an additional
+        getTransaction pass before it can feed _build_pattern.
+        """
+        return self._mock_batch(chunk)
+    
+    def _mock_batch(self, payload: List[dict]) -> List[dict]:
+        """Mock RPC batch"""
+        now = datetime.now()
+        handlers = {
+            "getAccountInfo": self._mock_account_info,
+            "getSignaturesForAddress": self._mock_transactions,
+            "getTokenAccountsByOwner": self._mock_token_accounts,
+        }
+        return [
+            {"jsonrpc": "2.0", "id": request["id"], "result": handlers[request["method"]](request["params"][0], now)}
+            for request in payload
+        ]
+    
+    def _mock_account_info(self, address: str, now: datetime) -> dict:
+        """Mock basic account information"""
         return {
-            "address": address,
-            "lamports": 1000000000,
-            "owner": "11111111111111111111111111111111",
-            "executable": False,
-            "rentEpoch": 361
+            "value": {
+                "address": address,
+                "lamports": 1000000000,
+                "owner": "11111111111111111111111111111111",
+                "executable": False,
+                "rentEpoch": 361
+            }
         }
     
-    async def _fetch_transactions(self, address: str, limit: int = 1000) -> List[dict]:
-        """Fetch transaction history"""
-        await asyncio.sleep(0.1)
-        # Mock transaction data
+    def _mock_transactions(self, address: str, now: datetime, limit: int = 1000) -> List[dict]:
+        """Mock transaction history"""
         transactions = []
         for i in range(min(limit, 100)):  # Simulate fewer transactions
             transactions.append({
                 "signature": f"tx_{i}_{address[:8]}",
                 "amount": np.random.exponential(0.1) * 1000000000,  # Lamports
                 "counterpart": f"wallet_{i % 20}",
-                "timestamp": datetime.now() - timedelta(days=i),
+                "timestamp": now - timedelta(days=i),
                 "type": "transfer"
             })
         return transactions
     
-    async def _fetch_token_accounts(self, address: str) -> List[dict]:
-        """Fetch token account information"""
-        await asyncio.sleep(0.1)
-        return []  # Simplified for MVP
+    def _mock_token_accounts(self, address: str, now: datetime) -> dict:
+        """Mock token account information"""
+        return {"value": []}  # Simplified for MVP
     
     def _parse_creation_time(self, account_info: dict) -> datetime:
         """Estimate account creation time"""
@@ -163,16 +572,28 @@ class FraudDataCollector:
             quick_sells=0,
             rugpull_history=1 if address in self.known_rugpulls else 0,
             timelock_violations=0,
-            social_signals=0
+            social_signals=0,
+            is_fallback=True
         )
 
 class FraudDetectionModel:
     """Machine learning model for fraud detection"""
     
     def __init__(self):
-        self.model = IsolationForest(contamination=0.1, random_state=42)
+        self.model = IsolationForest(contamination=0.1, random_state=42, n_jobs=-1)
+        # GPU-trained cuML forest with its own scaler; the sklearn model stays as fallback
+        self.gpu_model = None
+        self.gpu_scaler: Optional[StandardScaler] = None
+        self.booster = None
+        self._booster_columns: Optional[List[int]] = None
+        self._flat_trees: Optional[Tuple[np.ndarray, ...]] = None
+        self._codegen_scorer = None
         self.scaler = StandardScaler()
         self.is_trained = False
+        self.backend = MODEL_BACKEND
+        if self.backend == "lightgbm" and lgb is None:
+            logger.warning("lightgbm not installed, falling back to IsolationForest")
+            self.backend = "isolation_forest"
         self.feature_names = [
             'transaction_count', 'total_volume', 'unique_interactions',
             'token_launches', 'quick_sells', 'rugpull_history',
@@ -180,122 +601,278 @@ class FraudDetectionModel:
             'avg_transaction_size', 'interaction_diversity'
         ]
     
-    def extract_features(self, pattern: WalletPattern) -> np.ndarray:
+    def extract_features(self, pattern: WalletPattern, now: Optional[datetime] = None) -> np.ndarray:
         """Extract numerical features from wallet pattern"""
-        account_age = (datetime.now() - pattern.creation_time).days
-        avg_tx_size = pattern.total_volume / max(pattern.transaction_count, 1)
-        interaction_diversity = pattern.unique_interactions / max(pattern.transaction_count, 1)
-        
-        features = np.array([
-            pattern.transaction_count,
-            pattern.total_volume,
-            pattern.unique_interactions,
-            pattern.token_launches,
-            pattern.quick_sells,
-            pattern.rugpull_history,
-            pattern.timelock_violations,
-            pattern.social_signals,
-            account_age,
-            avg_tx_size,
-            interaction_diversity
-        ])
-        
-        return features.reshape(1, -1)
+        return self.build_feature_matrix([pattern], now)
     
-    def train(self, patterns: List[WalletPattern]) -> None:
+    def build_feature_matrix(self, patterns: Union[List[WalletPattern], WalletPatternBatch],
+                             now: Optional[datetime] = None) -> np.ndarray:
+        """Extract features for many wallet patterns into one (N, 11) matrix"""
+        if not isinstance(patterns, WalletPatternBatch):
+            patterns = WalletPatternBatch.from_patterns(patterns)
+        return patterns.to_feature_matrix(now)
+    
+    def train(self, patterns: Union[List[WalletPattern], WalletPatternBatch],
+              labels: Optional[np.ndarray] = None, device: str = "cpu") -> None:
         """Train the fraud detection model"""
         logger.info(f"Training model with {len(patterns)} wallet patterns")
         
         # Extract features
-        feature_matrix = []
-        for pattern in patterns:
-            features = self.extract_features(pattern)
-            feature_matrix.append(features.flatten())
+        batch = patterns if isinstance(patterns, WalletPatternBatch) else WalletPatternBatch.from_patterns(patterns)
+        X = batch.to_feature_matrix()
+        
+        if device == "gpu":
+            self._train_gpu(X)
+            logger.info("GPU model training completed")
+            return
         
-        X = np.array(feature_matrix)
+        # Scale features, then halve their width for the forest
+        X_scaled = self.scaler.fit_transform(X).astype(np.float32)
         
-        # Scale features
-        X_scaled = self.scaler.fit_transform(X)
+        use_booster = False
+        if self.backend == "lightgbm":
+            # Supervised booster: known rugpulls vs legitimate projects
+            if labels is None:
+                raise ValueError("LightGBM backend needs rugpull/legitimate labels")
+            labels = np.asarray(labels)
+            labeled = labels != LABEL_UNKNOWN
+            if len(np.unique(labels[labeled])) < 2:
+                raise ValueError("LightGBM backend needs both rugpull and legitimate examples")
+            use_booster = labeled.sum() >= BOOSTER_MIN_TRAINING_ROWS
+            if not use_booster:
+                logger.warning(f"Only {labeled.sum()} labeled wallets, too few for a booster; "
+                               f"training IsolationForest instead")
         
-        # Train isolation forest
-        self.model.fit(X_scaled)
+        if use_booster:
+            self._booster_columns = [
+                i for i, name in enumerate(self.feature_names) if name not in BOOSTER_EXCLUDED_FEATURES
+            ]
+            params = {'objective': 'binary', 'num_leaves': 31, 'min_data_in_leaf': 20, 'verbose': -1}
+            self.booster = lgb.train(
+                params,
+                lgb.Dataset(X_scaled[labeled][:, self._booster_columns], label=labels[labeled])
+            )
+        else:
+            # Train isolation forest; it supersedes any earlier booster or GPU forest
+            self.model.fit(X_scaled)
+            self.booster = None
+            self.gpu_model = self.gpu_scaler = None
+            self._pack_trees()
         self.is_trained = True
         
         logger.info("Model training completed")
     
-    def predict_fraud_score(self, pattern: WalletPattern) -> float:
+    def _train_gpu(self, X: np.ndarray) -> None:
+        """Train a cuML isolation forest alongside the sklearn inference model"""
+        if not GPU_AVAILABLE:
+            raise ValueError("GPU training requested but cuML is not installed")
+        if self.backend == "lightgbm":
+            raise ValueError("GPU training is only supported for the IsolationForest backend")
+        
+        scaler = StandardScaler()
+        X_scaled = scaler.fit_transform(X).astype(np.float32)
+        self.gpu_model = CumlIsolationForest(n_estimators=100).fit(cudf.DataFrame(X_scaled))
+        self.gpu_scaler = scaler
+    
+    def predict_fraud_score(self, pattern: WalletPattern, now: Optional[datetime] = None) -> float:
         """Predict fraud score (0.0 = legitimate, 1.0 = definite fraud)"""
+        now = now or datetime.now()
         if not self.is_trained:
             # Fallback to rule-based scoring
-            return self._rule_based_score(pattern)
-        
-        features = self.extract_features(pattern)
-        features_scaled = self.scaler.transform(features)
+            return self._rule_based_score(pattern, now)
         
-        # Get anomaly score (-1 to 1, where -1 is most anomalous)
-        anomaly_score = self.model.decision_function(features_scaled)[0]
-        
-        # Convert to fraud probability (0 to 1)
-        fraud_score = max(0.0, min(1.0, (1 - anomaly_score) / 2))
-        
-        return fraud_score
+        return float(self.predict_batch(self.extract_features(pattern, now))[0])
     
-    def _rule_based_score(self, pattern: WalletPattern) -> float:
-        """Fallback rule-based scoring when model not trained"""
-        score = 0.0
-        
-        # Known rugpull history
-        if pattern.rugpull_history > 0:
-            score += 0.8
+    def predict_fraud_scores(self, patterns: List[WalletPattern],
+                             now: Optional[datetime] = None) -> np.ndarray:
+        """Predict fraud scores for many wallet patterns in a single pass"""
+        now = now or datetime.now()
+        if not self.is_trained:
+            return np.array([self._rule_based_score(p, now) for p in patterns], dtype=np.float64)
         
-        # Quick sell behavior
-        if pattern.quick_sells > pattern.token_launches * 0.5:
-            score += 0.3
+        return self.predict_batch(self.build_feature_matrix(patterns, now))
+    
+    def predict_batch(self, X: np.ndarray) -> np.ndarray:
+        """Score a raw (N, 11) feature matrix with one model call"""
+        if self.gpu_model is not None:
+            X_gpu = self.gpu_scaler.transform(X).astype(np.float32)
+            anomaly_scores = np.asarray(self.gpu_model.decision_function(X_gpu))
+            return np.clip((1 - anomaly_scores) / 2, 0.0, 1.0)
         
-        # Low social signals
-        if pattern.social_signals == 0:
-            score += 0.2
+        X_scaled = self.scaler.transform(X).astype(np.float32)
         
-        # High timelock violations
-        if pattern.timelock_violations > 0:
-            score += 0.4
+        if self.booster is not None:
+            # Booster already predicts fraud probability; it never sees
+            # rugpull_history, so listed rugpull wallets are scored as fraud
+            probabilities = self.booster.predict(X_scaled[:, self._booster_columns])
+            rugpull = X[:, self.feature_names.index('rugpull_history')] > 0
+            return np.where(rugpull, 1.0, probabilities)
         
-        # New account with high activity
-        account_age = (datetime.now() - pattern.creation_time).days
-        if account_age < 30 and pattern.transaction_count > 100:
-            score += 0.3
+        # Get anomaly scores (-1 to 1, where -1 is most anomalous)
+        if self._codegen_scorer is not None:
+            anomaly_scores = np.asarray(self._codegen_scorer(X_scaled)) - self.model.offset_
+        elif self._flat_trees is not None:
+            X_tree = np.ascontiguousarray(X_scaled)
+            anomaly_scores = score_samples_flat(X_tree, *self._flat_trees) - self.model.offset_
+        else:
+            # (threading backend lets the trees be evaluated across cores)
+            with parallel_backend('threading', n_jobs=-1):
+                anomaly_scores = self.model.decision_function(X_scaled)
         
-        return min(1.0, score)
+        # Convert to fraud probabilities (0 to 1)
+        return np.clip((1 - anomaly_scores) / 2, 0.0, 1.0)
+    
+    def _pack_trees(self, flat_trees: Optional[Tuple[np.ndarray, ...]] = None) -> None:
+        """Rebuild (or reuse already packed) forest arrays and generated scorer"""
+        if not (USE_FLAT or USE_CODEGEN):
+            flat_trees = None
+        elif flat_trees is None:
+            flat_trees = pack_trees_wdfs(self.model)
+        if flat_trees is not None and not flat_scores_match_sklearn(self.model, flat_trees):
+            logger.warning("Packed trees disagree with IsolationForest.score_samples, scoring with sklearn")
+            flat_trees = None
+        self._codegen_scorer = generate_forest_scorer(flat_trees) if USE_CODEGEN and flat_trees is not None else None
+        self._flat_trees = flat_trees if USE_FLAT else None
+    
+    def _rule_based_score(self, pattern: WalletPattern, now: datetime) -> float:
+        """Fallback rule-based scoring when model not trained"""
+        return _rule_kernel(
+            pattern.rugpull_history,
+            pattern.quick_sells,
+            pattern.token_launches,
+            pattern.social_signals,
+            pattern.timelock_violations,
+            (now - pattern.creation_time).days,
+            pattern.transaction_count
+        )
     
     def save_model(self, filepath: str) -> None:
         """Save trained model to disk"""
         model_data = {
             'model': self.model,
+            'booster': self.booster.model_to_string() if self.booster is not None else None,
+            'booster_columns': self._booster_columns,
+            'backend': self.backend,
+            'flat_trees': self._flat_trees,
             'scaler': self.scaler,
             'is_trained': self.is_trained,
-            'feature_names': self.feature_names
+            'feature_names': self.feature_names,
+            'feature_version': FEATURE_VERSION
         }
-        with open(filepath, 'wb') as f:
-            pickle.dump(model_data, f)
+        # Write uncompressed so load_model can memory-map the packed trees, and
+        # swap the file in atomically so a live mapping is never truncated
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
+        joblib.dump(model_data, tmp_path)
+        os.replace(tmp_path, filepath)
+    
+    def save_gpu_model(self, filepath: str) -> None:
+        """Save the cuML forest and its scaler (cuML models persist via pickle)"""
+        tmp_path = f"{filepath}.{os.getpid()}.tmp"
+        joblib.dump({'model': self.gpu_model, 'scaler': self.gpu_scaler,
+                     'feature_version': FEATURE_VERSION}, tmp_path)
+        os.replace(tmp_path, filepath)
+    
+    def load_gpu_model(self, filepath: str) -> None:
+        """Load a cuML forest saved by save_gpu_model"""
+        model_data = joblib.load(filepath)
+        feature_version = model_data.get('feature_version', 1)
+        if feature_version != FEATURE_VERSION:
+            raise ValueError(f"{filepath} uses feature version {feature_version}, expected {FEATURE_VERSION}")
+        self.gpu_model = model_data['model']
+        self.gpu_scaler = model_data['scaler']
     
     def load_model(self, filepath: str) -> None:
         """Load trained model from disk"""
-        with open(filepath, 'rb') as f:
-            model_data = pickle.load(f)
+        # Packed tree arrays stay memory-mapped and are paged in on demand;
+        # the sklearn forest copies its node arrays when unpickled
+        model_data = joblib.load(filepath, mmap_mode='r')
+        
+        feature_version = model_data.get('feature_version', 1)
+        if feature_version != FEATURE_VERSION:
+            raise ValueError(f"{filepath} uses feature version {feature_version}, expected {FEATURE_VERSION}")
+        
+        # A model trained for another backend is retrained, not adopted
+        booster = model_data.get('booster')
+        saved_backend = model_data.get('backend', "lightgbm" if booster is not None else "isolation_forest")
+        if saved_backend != self.backend:
+            raise ValueError(f"{filepath} was trained for the {saved_backend} backend, not {self.backend}")
         
         self.model = model_data['model']
+        self.booster = None
+        if booster is not None:
+            self.booster = lgb.Booster(model_str=booster)
+            self._booster_columns = model_data['booster_columns']
         self.scaler = model_data['scaler']
         self.is_trained = model_data['is_trained']
         self.feature_names = model_data['feature_names']
+        self._flat_trees = None
+        self._codegen_scorer = None
+        self.gpu_model = self.gpu_scaler = None
+        if self.is_trained and self.booster is None:
+            self._pack_trees(model_data.get('flat_trees'))
+
+def _insurance_count(config: dict) -> int:
+    return len(config.get('insurance_wallets', []))
+
+def _fee_margin(config: dict) -> float:
+    """Paid launch fee minus 90% of the expected fee"""
+    expected_fee = 0.01 + (_insurance_count(config) * 0.01)
+    return float(config.get('launch_fee', 0)) - expected_fee * 0.9
+
+def _between(value, bounds) -> bool:
+    return bounds[0] <= value < bounds[1]
+
+# Launch parameter red flags: (getter, comparison, threshold, weight)
+_PARAM_RULES = [
+    (lambda c: int(c.get('supply', 0)), operator.gt, 1000000000000, 0.3),  # > 1 trillion
+    (lambda c: c.get('timelock_duration', 0), operator.lt, MIN_TIMELOCK_SECONDS, 0.5),  # Below minimum
+    (lambda c: c.get('timelock_duration', 0), _between,
+     (MIN_TIMELOCK_SECONDS, SAFE_TIMELOCK_SECONDS), 0.2),  # Barely acceptable
+    (_insurance_count, operator.gt, 5, 0.3),  # Too many bailout options
+    (_insurance_count, operator.eq, 0, 0.4),  # No insurance
+    (_fee_margin, operator.lt, 0.0, 0.3),  # Trying to underpay
+]
+
+# Launch parameter risk factors: (getter, comparison, threshold, message)
+_PARAM_RISK_FACTORS = [
+    (lambda c: c.get('timelock_duration', 0), operator.lt, MIN_TIMELOCK_SECONDS,
+     "Timelock below minimum safety threshold"),
+    (_insurance_count, operator.gt, 3, "Excessive number of insurance wallets"),
+]
+
+# Overall score risk factors, each applied when the score exceeds its threshold
+_SCORE_RISK_FACTORS = [
+    (0.7, "High fraud probability detected"),
+    (0.5, "Multiple red flags identified"),
+]
+
+# Recommendation for the first threshold the score exceeds, highest first
+_RECOMMENDATIONS = [
+    (0.8, "REJECT: High fraud risk"),
+    (0.6, "CAUTION: Require additional verification"),
+    (0.4, "MONITOR: Watch for suspicious activity"),
+    (float('-inf'), "APPROVE: Low fraud risk"),
+]
 
 class LaunchAnalyzer:
     """Analyzes token launch parameters for fraud indicators"""
     
     def __init__(self, fraud_model: FraudDetectionModel):
         self.fraud_model = fraud_model
+        # Shared collector set on app startup; None opens a session per fetch
+        self.collector: Optional[FraudDataCollector] = None
+        # Recent wallet patterns and scores, keyed by address
+        self._wallet_pattern_cache: TTLCache = TTLCache(maxsize=50_000, ttl=300)
+        self._wallet_score_cache: TTLCache = TTLCache(maxsize=50_000, ttl=300)
     
-    async def analyze_launch(self, launch_config: dict) -> dict:
+    def clear_cache(self) -> None:
+        """Drop cached wallet data, e.g. after the model is retrained"""
+        self._wallet_pattern_cache.clear()
+        self._wallet_score_cache.clear()
+    
+    async def analyze_launch(self, launch_config: dict, now: Optional[datetime] = None) -> dict:
         """Comprehensive analysis of token launch configuration"""
+        now = now or datetime.now()
         analysis = {
             'fraud_score': 0.0,
             'risk_factors': [],
@@ -303,15 +880,18 @@ class LaunchAnalyzer:
             'wallet_scores': {}
         }
         
-        # Analyze creator wallet
-        creator_score = await self._analyze_wallet(launch_config.get('creator_wallet', ''))
+        # Score creator and insurance wallets in one batch
+        insurance_wallets = launch_config.get('insurance_wallets', [])
+        addresses = [launch_config.get('creator_wallet', '')] + list(insurance_wallets)
+        wallet_scores = await self._analyze_wallets(addresses, now)
+        
+        # Creator wallet carries 40% weight
+        creator_score = wallet_scores[0]
         analysis['wallet_scores']['creator'] = creator_score
-        analysis['fraud_score'] += creator_score * 0.4  # 40% weight
+        analysis['fraud_score'] += creator_score * 0.4
         
-        # Analyze insurance wallets
-        insurance_wallets = launch_config.get('insurance_wallets', [])
-        for i, wallet in enumerate(insurance_wallets):
-            wallet_score = await self._analyze_wallet(wallet)
+        # Insurance wallets share 30% weight
+        for i, wallet_score in enumerate(wallet_scores[1:]):
             analysis['wallet_scores'][f'insurance_{i}'] = wallet_score
             analysis['fraud_score'] += wallet_score * (0.3 / len(insurance_wallets))
         
@@ -327,44 +907,56 @@ class LaunchAnalyzer:
         
         return analysis
     
-    async def _analyze_wallet(self, address: str) -> float:
-        """Analyze individual wallet for fraud indicators"""
-        if not address:
-            return 0.5  # Unknown wallet gets medium risk
+    async def _analyze_wallets(self, addresses: List[str], now: datetime) -> List[float]:
+        """Analyze several wallets, scoring all collected patterns at once"""
+        # Unknown wallets get medium risk
+        scores = [0.5] * len(addresses)
+        pending = []
+        for i, address in enumerate(addresses):
+            if not address:
+                continue
+            if address in self._wallet_score_cache:
+                scores[i] = self._wallet_score_cache[address]
+            else:
+                pending.append(i)
+        if not pending:
+            return scores
+        
+        patterns = await self._collect_patterns([addresses[i] for i in pending])
+        
+        for i, pattern, score in zip(pending, patterns, self.fraud_model.predict_fraud_scores(patterns, now)):
+            scores[i] = float(score)
+            # Don't pin a wallet to the placeholder profile after a failed fetch
+            if not pattern.is_fallback:
+                self._wallet_score_cache[addresses[i]] = scores[i]
+        return scores
+    
+    async def _collect_patterns(self, addresses: List[str]) -> List[WalletPattern]:
+        """Collect wallet patterns, reusing recently fetched ones"""
+        collected = {}
+        for address in addresses:
+            pattern = self._wallet_pattern_cache.get(address)
+            if pattern is not None:
+                collected[address] = pattern
         
-        async with FraudDataCollector() as collector:
-            pattern = await collector.collect_wallet_data(address)
-            return self.fraud_model.predict_fraud_score(pattern)
+        missing = [a for a in dict.fromkeys(addresses) if a not in collected]
+        if missing:
+            if self.collector is not None:
+                fetched = await self.collector.collect_wallets_data(missing)
+            else:
+                async with FraudDataCollector() as collector:
+                    fetched = await collector.collect_wallets_data(missing)
+            for address, pattern in zip(missing, fetched):
+                collected[address] = pattern
+                if not pattern.is_fallback:
+                    self._wallet_pattern_cache[address] = pattern
+        
+        return [collected[address] for address in addresses]
     
     def _analyze_parameters(self, config: dict) -> float:
         """Analyze launch parameters for red flags"""
-        score = 0.0
-        
-        # Token supply analysis
-        supply = int(config.get('supply', 0))
-        if supply > 1000000000000:  # > 1 trillion
-            score += 0.3
-        
-        # Timelock analysis
-        timelock_days = config.get('timelock_duration', 0) // 86400
-        if timelock_days < 100:  # Below minimum
-            score += 0.5
-        elif timelock_days < 200:  # Barely acceptable
-            score += 0.2
-        
-        # Insurance wallet count
-        insurance_count = len(config.get('insurance_wallets', []))
-        if insurance_count > 5:  # Too many bailout options
-            score += 0.3
-        elif insurance_count == 0:  # No insurance
-            score += 0.4
-        
-        # Fee analysis
-        launch_fee = float(config.get('launch_fee', 0))
-        expected_fee = 0.01 + (insurance_count * 0.01)
-        if launch_fee < expected_fee * 0.9:  # Trying to underpay
-            score += 0.3
-        
+        score = sum(weight for getter, compare, threshold, weight in _PARAM_RULES
+                    if compare(getter(config), threshold))
         return min(1.0, score)
     
     def _generate_risk_assessment(self, config: dict, analysis: dict) -> None:
@@ -372,10 +964,9 @@ class LaunchAnalyzer:
         score = analysis['fraud_score']
         
         # Risk factors
-        if score > 0.7:
-            analysis['risk_factors'].append("High fraud probability detected")
-        if score > 0.5:
-            analysis['risk_factors'].append("Multiple red flags identified")
+        analysis['risk_factors'].extend(
+            message for threshold, message in _SCORE_RISK_FACTORS if score > threshold
+        )
         
         # Wallet-specific risks
         for wallet_id, wallet_score in analysis['wallet_scores'].items():
@@ -383,36 +974,34 @@ class LaunchAnalyzer:
                 analysis['risk_factors'].append(f"Suspicious {wallet_id} wallet behavior")
         
         # Parameter risks
-        timelock_days = config.get('timelock_duration', 0) // 86400
-        if timelock_days < 100:
-            analysis['risk_factors'].append("Timelock below minimum safety threshold")
-        
-        insurance_count = len(config.get('insurance_wallets', []))
-        if insurance_count > 3:
-            analysis['risk_factors'].append("Excessive number of insurance wallets")
+        analysis['risk_factors'].extend(
+            message for getter, compare, threshold, message in _PARAM_RISK_FACTORS
+            if compare(getter(config), threshold)
+        )
         
         # Recommendations
-        if score > 0.8:
-            analysis['recommendations'].append("REJECT: High fraud risk")
-        elif score > 0.6:
-            analysis['recommendations'].append("CAUTION: Require additional verification")
-        elif score > 0.4:
-            analysis['recommendations'].append("MONITOR: Watch for suspicious activity")
-        else:
-            analysis['recommendations'].append("APPROVE: Low fraud risk")
+        analysis['recommendations'].append(
+            next(message for threshold, message in _RECOMMENDATIONS if score > threshold)
+        )
 
 # FastAPI Web Service
-app = FastAPI(title="SolD Fraud Detection API", version="1.0.0")
+app = FastAPI(
+    title="SolD Fraud Detection API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # Global model instance
 fraud_model = FraudDetectionModel()
 launch_analyzer = LaunchAnalyzer(fraud_model)
 
 class LaunchRequest(BaseModel):
+    model_config = ConfigDict(frozen=True)
+    
     creator_wallet: str
     insurance_wallets: List[str] = []
     supply: str = "1000000"
-    timelock_duration: int = 8640000  # 100 days in seconds
+    timelock_duration: int = MIN_TIMELOCK_SECONDS  # 100 days in seconds
     launch_fee: str = "0.01"
     network: str = "DEVNET"
 
@@ -424,42 +1013,132 @@ class FraudResponse(BaseModel):
     wallet_scores: Dict[str, float]
     processing_time_ms: int
 
-@app.on_startup
+@app.on_event("startup")
 async def startup_event():
     """Initialize the fraud detection model on startup"""
     logger.info("Starting fraud detection service...")
     
-    # Load pre-trained model or train with mock data
-    try:
-        fraud_model.load_model("fraud_model.pkl")
-        logger.info("Loaded pre-trained fraud model")
-    except FileNotFoundError:
-        logger.info("Training new fraud model with mock data...")
-        await train_initial_model()
+    # One collector (and HTTP connection pool) for the whole process
+    app.state.collector = FraudDataCollector()
+    await app.state.collector.__aenter__()
+    launch_analyzer.collector = app.state.collector
+    
+    # Load pre-trained model or train with mock data; workers take turns so
+    # only the first trains and the rest load what it saved
+    async with _model_file_lock():
+        try:
+            await _load_model_from_disk()
+            logger.info("Loaded pre-trained fraud model")
+        except FileNotFoundError:
+            logger.info("Training new fraud model with mock data...")
+            await train_initial_model()
+        except Exception as e:
+            # e.g. saved with an optional backend this host lacks
+            logger.warning(f"Could not load {MODEL_PATH} ({e}), retraining with mock data...")
+            await train_initial_model()
+    
+    # Compile kernels and warm the scoring path now rather than on the first request
+    _rule_kernel(0, 0, 0, 0, 0, 0, 0)
+    dummy = app.state.collector._default_pattern("warmup")
+    fraud_model.predict_fraud_score(dummy)
+    await launch_analyzer.analyze_launch({'creator_wallet': 'warmup', 'insurance_wallets': []})
+    launch_analyzer.clear_cache()
+    logger.info("Fraud detection service warmed up")
+    
+    app.state.model_watcher = asyncio.create_task(_watch_model_files())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop watching model files and release the shared HTTP session"""
+    app.state.model_watcher.cancel()
+    launch_analyzer.collector = None
+    await app.state.collector.__aexit__(None, None, None)
+
+@asynccontextmanager
+async def _model_file_lock():
+    """Exclusive lock serialising model training across worker processes"""
+    with open(f"{MODEL_PATH}.lock", "w") as lock_file:
+        await asyncio.to_thread(fcntl.flock, lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _model_mtimes() -> Tuple[Optional[float], Optional[float]]:
+    """Modification times of the saved CPU and GPU models, None if absent"""
+    return tuple(os.path.getmtime(path) if os.path.exists(path) else None
+                 for path in (MODEL_PATH, GPU_MODEL_PATH))
 
-async def train_initial_model():
+def _load_persisted_model(mtimes: Tuple[Optional[float], Optional[float]]) -> FraudDetectionModel:
+    """Load MODEL_PATH into a new model, preferring a newer GPU forest where cuML is available"""
+    cpu_mtime, gpu_mtime = mtimes
+    model = FraudDetectionModel()
+    model.load_model(MODEL_PATH)
+    
+    # sklearn remains the fallback when the GPU forest is stale or unloadable
+    if (GPU_AVAILABLE and model.backend == "isolation_forest"
+            and gpu_mtime is not None and gpu_mtime > cpu_mtime):
+        try:
+            model.load_gpu_model(GPU_MODEL_PATH)
+            logger.info("Loaded GPU fraud model")
+        except Exception as e:
+            logger.warning(f"Could not load {GPU_MODEL_PATH} ({e}), using CPU model")
+    return model
+
+async def _load_model_from_disk() -> None:
+    """Load the saved model off the event loop and serve it once fully loaded"""
+    global fraud_model
+    mtimes = _model_mtimes()
+    model = await asyncio.to_thread(_load_persisted_model, mtimes)
+    fraud_model = launch_analyzer.fraud_model = model
+    app.state.model_mtimes = mtimes
+
+async def _watch_model_files() -> None:
+    """Reload the model whenever another worker's /retrain replaces its files"""
+    while True:
+        await asyncio.sleep(MODEL_RELOAD_INTERVAL_SECONDS)
+        if _model_mtimes() == app.state.model_mtimes:
+            continue
+        async with _model_file_lock():
+            if _model_mtimes() == app.state.model_mtimes:
+                continue
+            try:
+                await _load_model_from_disk()
+            except Exception as e:
+                # Recorded mtimes are left stale, so the next check retries
+                logger.warning(f"Could not reload {MODEL_PATH} ({e}), keeping current model")
+                continue
+        launch_analyzer.clear_cache()
+        logger.info("Reloaded fraud model saved by another worker")
+
+async def train_initial_model(device: str = "cpu"):
     """Train initial model with mock data"""
-    patterns = []
-    
-    async with FraudDataCollector() as collector:
-        # Add known rugpull patterns
-        for address in collector.known_rugpulls:
-            pattern = await collector.collect_wallet_data(address)
-            patterns.append(pattern)
-        
-        # Add legitimate project patterns
-        for address in collector.legitimate_projects:
-            pattern = await collector.collect_wallet_data(address)
-            patterns.append(pattern)
-        
-        # Generate additional synthetic patterns
-        for i in range(50):
-            fake_address = f"mock_wallet_{i:08d}"
-            pattern = await collector.collect_wallet_data(fake_address)
-            patterns.append(pattern)
-    
-    fraud_model.train(patterns)
-    fraud_model.save_model("fraud_model.pkl")
+    collector = app.state.collector
+    
+    # Known rugpulls, legitimate projects and synthetic wallets
+    addresses = (
+        sorted(collector.known_rugpulls)
+        + sorted(collector.legitimate_projects)
+        + [f"mock_wallet_{i:08d}" for i in range(50)]
+    )
+    
+    labels = [
+        LABEL_RUGPULL if address in collector.known_rugpulls
+        else LABEL_LEGITIMATE if address in collector.legitimate_projects
+        else LABEL_UNKNOWN
+        for address in addresses
+    ]
+    
+    # Fetch concurrently; the collector bounds requests to provider limits
+    patterns = await asyncio.gather(*(collector.collect_wallet_data(address) for address in addresses))
+    
+    fraud_model.train(patterns, labels, device=device)
+    if device == "gpu":
+        fraud_model.save_gpu_model(GPU_MODEL_PATH)
+    else:
+        fraud_model.save_model(MODEL_PATH)
+    # Our own save is not a change for _watch_model_files to pick up
+    app.state.model_mtimes = _model_mtimes()
     logger.info("Initial model training completed")
 
 @app.post("/analyze-launch", response_model=FraudResponse)
@@ -478,7 +1157,7 @@ async def analyze_launch_endpoint(request: LaunchRequest):
         }
         
         # Perform analysis
-        analysis = await launch_analyzer.analyze_launch(config)
+        analysis = await launch_analyzer.analyze_launch(config, now=start_time)
         
         # Determine risk level
         score = analysis['fraud_score']
@@ -518,13 +1197,36 @@ async def health_check():
     }
 
 @app.post("/retrain")
-async def retrain_model():
-    """Retrain the fraud detection model"""
+async def retrain_model(device: str = "cpu"):
+    """Retrain the fraud detection model on "cpu" or "gpu" (cuML)
+    
+    Other workers reload the saved model within MODEL_RELOAD_INTERVAL_SECONDS.
+    """
+    if device not in ("cpu", "gpu"):
+        raise HTTPException(status_code=400, detail=f"Unknown device: {device}")
+    if device == "gpu" and not GPU_AVAILABLE:
+        raise HTTPException(status_code=400, detail="GPU retraining is not available on this host")
+    if device == "gpu" and fraud_model.backend == "lightgbm":
+        raise HTTPException(status_code=400, detail="GPU retraining requires the IsolationForest backend")
+    
     try:
-        await train_initial_model()
+        async with _model_file_lock():
+            await train_initial_model(device)
+        launch_analyzer.clear_cache()
         return {"status": "Model retrained successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Retraining failed: {str(e)}")
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Each worker runs startup_event with its own HTTP session; the model is
+    # trained once and shared through MODEL_PATH
+    workers = int(os.environ.get("WORKERS", os.cpu_count() or 1))
+    uvicorn.run(
+        # Multiple workers need an import string rather than the app object
+        f"{os.path.splitext(os.path.basename(__file__))[0]}:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8000)),
+        loop="uvloop",
+        http="httptools",
+        workers=workers
+    )